@@ -8,13 +8,10 @@ and generate a LaTeX document.
 
 import argparse
 import logging
+import operator
 import sys
-import random
 from typing import Dict, List, Any, Optional, Tuple
 
-from puzzle_extractor.csv_parser import PuzzleCSVParser
-from puzzle_extractor.filter import PuzzleFilter
-from puzzle_extractor.latex_generator import LaTeXGenerator
 from puzzle_extractor.themes import validate_themes, parse_mix_ratio, TACTICAL_THEMES
 
 # Configure logging
@@ -189,6 +186,12 @@ def main() -> int:
         # Process puzzle options
         mate_values, themes, ply_values, mix_ratio = process_puzzle_options(args)
         
+        # Import the processing modules only once the arguments are valid,
+        # so --help and usage errors do not pay for loading them
+        from puzzle_extractor.csv_parser import PuzzleCSVParser
+        from puzzle_extractor.filter import PuzzleFilter
+        from puzzle_extractor.latex_generator import LaTeXGenerator
+        
         # Initialize components
         csv_parser = PuzzleCSVParser(csv_path=args.file)
         puzzle_filter = PuzzleFilter()
@@ -196,9 +199,13 @@ def main() -> int:
         
         # Fetch puzzles based on the selected options
         tactical_ratio = mix_ratio[0] if mix_ratio else None
+
+        # Mixed sets also contain tactical puzzles, so the mate values must
+        # not restrict the filter, just as they do not restrict the parser
+        filter_mates = mate_values if tactical_ratio is None else None
         puzzles = puzzle_filter.filter_puzzles(
             puzzles=csv_parser.fetch_puzzles(
-                count=args.number * 3,  # Get more puzzles for filtering
+                count=args.number,
                 min_rating=args.min_rating,
                 max_rating=args.max_rating,
                 themes=themes,
@@ -211,27 +218,31 @@ def main() -> int:
             max_rating=args.max_rating,
             themes=themes,
             ply_values=ply_values,
-            mate_values=mate_values
+            mate_values=filter_mates
         )
         
         # Apply progressive difficulty if requested
         if args.progressive and puzzles:
-            puzzles.sort(key=lambda p: p.get('rating', 0))
+            # Every parsed puzzle carries a rating, so a C-level key suffices
+            puzzles.sort(key=operator.itemgetter('rating'))
             logger.info("Puzzles arranged in progressive difficulty")
         
         if not puzzles:
-            logger.warning(f"No puzzles found matching the criteria")
+            logger.warning("No puzzles found matching the criteria")
             return 1
             
-        logger.info(f"Generated a collection of {len(puzzles)} puzzles")
+        logger.info("Generated a collection of %s puzzles", len(puzzles))
+        
+        # The mate count is only shown when every puzzle shares it
+        hide_mate_count = len(mate_values) > 1
         
         # Generate LaTeX document
         latex_generator.generate_document(
             puzzles=puzzles,
             output_file=args.output,
             title=args.title,
-            mate_in=args.mate if args.mate else None,
-            hide_mate_count=True if (len(mate_values) > 1) else False,
+            mate_in=args.mate or None,
+            hide_mate_count=hide_mate_count,
             hide_ratings=args.hide_ratings,
             min_rating=args.min_rating,
             max_rating=args.max_rating,
@@ -241,11 +252,11 @@ def main() -> int:
             ply_values=ply_values
         )
         
-        logger.info(f"Successfully generated LaTeX document: {args.output}")
+        logger.info("Successfully generated LaTeX document: %s", args.output)
         return 0
         
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
 
 if __name__ == "__main__":
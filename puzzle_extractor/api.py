@@ -2,6 +2,7 @@
 Module for interacting with the Lichess API to fetch puzzles.
 """
 
+import json
 import logging
 import requests
 import time
@@ -10,6 +11,9 @@ from puzzle_extractor.puzzle_db import get_mate_puzzles
 
 logger = logging.getLogger(__name__)
 
+# Themes that mark a puzzle as a mate puzzle
+MATE_THEMES = frozenset(["mate", "mateIn1", "mateIn2", "mateIn3", "mateIn4", "mateIn5"])
+
 class LichessAPI:
     """Client for interacting with the Lichess API."""
     
@@ -30,7 +34,7 @@ class LichessAPI:
         Returns:
             List of puzzle dictionaries
         """
-        logger.info(f"Fetching {count} mate-in-{mate_in} puzzles...")
+        logger.info("Fetching %s mate-in-%s puzzles...", count, mate_in)
         
         # Try the Lichess API first
         api_puzzles = self._fetch_puzzles_from_api(mate_in, count)
@@ -40,7 +44,7 @@ class LichessAPI:
             return api_puzzles[:count]
         
         # If we didn't get enough puzzles from the API, use our fallback database
-        logger.warning(f"Only found {len(api_puzzles)} puzzles from API, using fallback database")
+        logger.warning("Only found %s puzzles from API, using fallback database", len(api_puzzles))
         fallback_puzzles = get_mate_puzzles(mate_in, count - len(api_puzzles))
         
         # Add the fallback puzzles to our list
@@ -48,11 +52,11 @@ class LichessAPI:
         
         # If we still don't have enough puzzles, log a warning
         if len(puzzles) < count:
-            logger.warning(f"Only found {len(puzzles)} mate-in-{mate_in} puzzles (including fallback), "
-                          f"which is less than the requested {count}")
+            logger.warning("Only found %s mate-in-%s puzzles (including fallback), "
+                           "which is less than the requested %s", len(puzzles), mate_in, count)
         
-        logger.info(f"Returning {len(puzzles)} puzzles ({len(api_puzzles)} from API, "
-                   f"{len(fallback_puzzles)} from fallback database)")
+        logger.info("Returning %s puzzles (%s from API, %s from fallback database)",
+                    len(puzzles), len(api_puzzles), len(fallback_puzzles))
         
         return puzzles[:count]  # Return only the requested count
     
@@ -76,13 +80,16 @@ class LichessAPI:
             response.raise_for_status()
             
             puzzle_data = response.json()
-            logger.debug(f"Got puzzle data from daily endpoint: {puzzle_data.get('puzzle', {}).get('id', 'unknown')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Got puzzle data from daily endpoint: %s",
+                             puzzle_data.get('puzzle', {}).get('id', 'unknown'))
             
             # Extract the puzzle, but don't add it if we're looking for mate puzzles (since daily puzzles are rarely mate puzzles)
-            if mate_in is None or self._is_mate_in_m(self._convert_puzzle_format(puzzle_data), mate_in):
-                puzzles.append(self._convert_puzzle_format(puzzle_data))
+            puzzle = self._convert_puzzle_format(puzzle_data)
+            if mate_in is None or self._is_mate_in_m(puzzle, mate_in):
+                puzzles.append(puzzle)
         except Exception as e:
-            logger.error(f"Error fetching puzzles from daily endpoint: {str(e)}")
+            logger.error("Error fetching puzzles from daily endpoint: %s", e)
         
         return puzzles
     
@@ -105,7 +112,7 @@ class LichessAPI:
         game_fen = game.get("fen", "")
         
         # Debug the raw puzzle data to understand its structure
-        logger.debug(f"Raw puzzle data: {puzzle_data}")
+        logger.debug("Raw puzzle data: %s", puzzle_data)
         
         # In the Lichess API, the puzzle position is often specified by:
         # 1. A base game FEN (game.fen)
@@ -126,26 +133,27 @@ class LichessAPI:
         if "fen" in puzzle:
             position_fen = puzzle.get("fen", "")
         
-        logger.debug(f"Game FEN: {game_fen}")
-        logger.debug(f"Moves to position: {moves_to_position}")
-        logger.debug(f"Position FEN (if available): {position_fen}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Game FEN: %s", game_fen)
+            logger.debug("Moves to position: %s", moves_to_position)
+            logger.debug("Position FEN (if available): %s", position_fen)
         
         # Use the position FEN if available, otherwise fall back to the game FEN
         fen = position_fen if position_fen else game_fen
         
         # If we still don't have a valid position, log a warning
         if not fen or fen == "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1":
-            logger.warning(f"Could not determine proper puzzle position for puzzle {puzzle.get('id', 'unknown')}")
+            logger.warning("Could not determine proper puzzle position for puzzle %s", puzzle.get('id', 'unknown'))
             
             # Let's try to extract it from the game PGN if available
             pgn = game.get("pgn", "")
             if pgn:
-                logger.debug(f"Game PGN: {pgn}")
+                logger.debug("Game PGN: %s", pgn)
                 # TODO: If needed, implement PGN parsing to extract position
         
         # DEBUG: Print the full puzzle data to examine its structure
-        import json
-        logger.debug(f"Full puzzle data: {json.dumps(puzzle_data, indent=2)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Full puzzle data: %s", json.dumps(puzzle_data, indent=2))
         
         # Convert to our internal format
         return {
@@ -168,10 +176,12 @@ class LichessAPI:
         Returns:
             True if the puzzle is a mate-in-M puzzle, False otherwise
         """
-        # Check if the puzzle has a theme that indicates it's a mate puzzle
+        # A puzzle tagged with the requested mate-in value is a match; a puzzle
+        # only tagged as a generic mate is accepted on its move count
         themes = puzzle.get("themes", [])
-        if not any(theme in themes for theme in ["mate", "mateIn1", "mateIn2", "mateIn3", "mateIn4", "mateIn5"]):
-            return False
+        if f"mateIn{mate_in}" not in themes:
+            if "mate" not in themes or any(t != "mate" and t in MATE_THEMES for t in themes):
+                return False
         
         # For mate-in-M puzzles, the solution should have approximately 2*M-1 moves
         # (M moves by the player, M-1 moves by the opponent)
@@ -194,12 +204,13 @@ class LichessAPI:
         """
         if not fen:
             return fen
-            
-        parts = fen.split()
-        if len(parts) < 2:
+        
+        # The side to move is the single character after the first space
+        turn_index = fen.find(" ") + 1
+        if turn_index == 0 or turn_index >= len(fen):
             return fen
-            
+        
         # Flip the turn (w -> b, b -> w)
-        parts[1] = "b" if parts[1] == "w" else "w"
+        turn = "b" if fen[turn_index] == "w" else "w"
         
-        return " ".join(parts) 
\ No newline at end of file
+        return fen[:turn_index] + turn + fen[turn_index + 1:] 
\ No newline at end of file
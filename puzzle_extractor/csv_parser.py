@@ -2,13 +2,24 @@
 Module for parsing the Lichess puzzle database CSV file.
 """
 
-import csv
 import logging
-import random
-from typing import List, Dict, Any, Optional
+import mmap
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Iterator, FrozenSet
+
+from puzzle_extractor.csv_rows import RowCriteria, row_rating, sample_chunk, sample_lines, scan_needles
+from puzzle_extractor.csv_scan import candidate_lines, chunk_bounds, line_at
+from puzzle_extractor.puzzle_index import PuzzleIndex
+from puzzle_extractor.sampling import GroupSampler, merge_samples, random_order
 
 logger = logging.getLogger(__name__)
 
+# Files at least this large are scanned by several worker processes
+PARALLEL_SCAN_MIN_BYTES = 64 * 1024 * 1024
+
 class PuzzleCSVParser:
     """Parse the Lichess puzzle database CSV file."""
     
@@ -48,117 +59,132 @@ class PuzzleCSVParser:
         Returns:
             List of puzzle dictionaries
         """
-        logger.info(f"Fetching {count} puzzles from CSV database")
+        logger.info("Fetching %s puzzles from CSV database", count)
+        
+        # Mate values only restrict the scan when no tactical puzzles are mixed in
+        required_mates = mate_values if tactical_ratio is None else None
+        needles = scan_needles(mate_in, themes, required_mates)
+        required_themes = frozenset(themes) if themes else None
+        
+        # Format the mate tags once rather than for every row
+        criteria = RowCriteria(
+            f"mateIn{mate_in}" if mate_in is not None else None,
+            required_themes,
+            ply_values,
+            min_rating,
+            max_rating,
+            frozenset(f"mateIn{m}" for m in required_mates) if required_mates else None
+        )
+        
+        # Sample size for each group of puzzles (keyed by "is a mate puzzle")
+        if tactical_ratio is not None and mate_values:
+            tactical_count = (count * tactical_ratio) // 100
+            sample_sizes = {False: tactical_count, True: count - tactical_count}
+            mate_themes = frozenset(f"mateIn{m}" for m in mate_values)
+        else:
+            sample_sizes = {False: count}
+            mate_themes = frozenset()
         
-        puzzles = []
         try:
-            with open(self.csv_path, 'r', encoding='utf-8') as file:
-                reader = csv.reader(file)
-                
-                # Skip header if it exists
-                first_row = next(reader, None)
-                if first_row and first_row[0].lower() == 'puzzleid':
-                    logger.debug("Skipped header row")
+            with open(self.csv_path, 'rb') as file, \
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lines = self._indexed_lines(mm, criteria)
+                if lines is not None:
+                    # Indexed lines come in random order, so the first matches
+                    # already are a uniform sample
+                    samplers = [sample_lines(lines, criteria, sample_sizes, mate_themes, stop_when_full=True)]
                 else:
-                    puzzle = self._parse_row(first_row)
-                    if self._matches_criteria(puzzle, mate_in, themes, ply_values, min_rating, max_rating):
-                        puzzles.append(puzzle)
-                
-                # Read and filter puzzles
-                for row in reader:
-                    if not row:  # Skip empty rows
-                        continue
-                        
-                    puzzle = self._parse_row(row)
-                    if self._matches_criteria(puzzle, mate_in, themes, ply_values, min_rating, max_rating):
-                        puzzles.append(puzzle)
-                    
-                    # Break if we have enough puzzles (with buffer)
-                    if len(puzzles) >= count * 3:
-                        break
+                    samplers = self._scan_samples(mm, needles, criteria, sample_sizes, mate_themes)
             
-            # Shuffle and select puzzles based on ratios if needed
-            if tactical_ratio is not None and mate_values:
-                tactical_count = (count * tactical_ratio) // 100
-                mate_count = count - tactical_count
-                
-                # Split puzzles into tactical and mate
-                tactical_puzzles = [p for p in puzzles if not any(f"mateIn{m}" in p.get("themes", []) for m in mate_values)]
-                mate_puzzles = [p for p in puzzles if any(f"mateIn{m}" in p.get("themes", []) for m in mate_values)]
-                
-                # Randomly select the required number of each type
-                random.shuffle(tactical_puzzles)
-                random.shuffle(mate_puzzles)
-                
-                puzzles = tactical_puzzles[:tactical_count] + mate_puzzles[:mate_count]
-            else:
-                # Just select the required number of puzzles
-                random.shuffle(puzzles)
-                puzzles = puzzles[:count]
+            # Tactical puzzles first, then mate puzzles, each in random order
+            puzzles = []
+            for group in sorted(sample_sizes):
+                puzzles.extend(self._parse_row(row) for row in merge_samples(samplers, group))
             
-            logger.info(f"Found {len(puzzles)} puzzles matching criteria")
+            logger.info("Found %s puzzles matching criteria", len(puzzles))
             return puzzles
             
         except FileNotFoundError:
-            logger.error(f"CSV file not found: {self.csv_path}")
+            logger.error("CSV file not found: %s", self.csv_path)
             return []
         except Exception as e:
-            logger.error(f"Error parsing CSV file: {str(e)}")
+            logger.error("Error parsing CSV file: %s", e)
             return []
     
-    def _matches_criteria(
+    def _scan_samples(
         self,
-        puzzle: Dict[str, Any],
-        mate_in: Optional[int],
-        themes: Optional[List[str]],
-        ply_values: Optional[List[int]],
-        min_rating: Optional[int],
-        max_rating: Optional[int]
-    ) -> bool:
+        mm: mmap.mmap,
+        needles: List[bytes],
+        criteria: RowCriteria,
+        sample_sizes: Dict[bool, int],
+        mate_themes: FrozenSet[str]
+    ) -> List[GroupSampler]:
+        """
+        Sample matching rows by scanning the whole CSV file.
+        
+        Large files are split into chunks of whole lines that are scanned
+        by worker processes, each keeping its own sample.
+        
+        Args:
+            mm: Memory-mapped CSV file
+            needles: Byte strings a candidate line must contain
+            criteria: Criteria a row must match
+            sample_sizes: Number of rows to sample for each group
+            mate_themes: Themes that put a row in the mate group
+            
+        Returns:
+            One sampler per scanned chunk
         """
-        Check if a puzzle matches all specified criteria.
+        workers = _worker_count()
+        if workers > 1 and len(mm) >= PARALLEL_SCAN_MIN_BYTES:
+            tasks = [
+                (self.csv_path, start, end, needles, criteria, sample_sizes, mate_themes)
+                for start, end in chunk_bounds(mm, workers)
+            ]
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    return list(executor.map(sample_chunk, tasks))
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning("Parallel scan unavailable, scanning in one process: %s", e)
+        
+        lines = (line for _, line in candidate_lines(mm, needles))
+        return [sample_lines(lines, criteria, sample_sizes, mate_themes)]
+    
+    def _indexed_lines(self, mm: mmap.mmap, criteria: RowCriteria) -> Optional[Iterator[bytes]]:
+        """
+        Look up candidate lines through the sidecar index.
+        
+        The index is built on first use, so only the first run has to scan
+        the whole database. The lookup may return extra lines; the rows are
+        still checked against all criteria.
         
         Args:
-            puzzle: The puzzle to check
-            mate_in: Required mate-in-M value
-            themes: Required tactical themes
-            ply_values: List of allowed ply counts
-            min_rating: Minimum rating
-            max_rating: Maximum rating
+            mm: Memory-mapped CSV file
+            criteria: Criteria a row must match
             
         Returns:
-            True if the puzzle matches all criteria
+            Candidate lines in random order, or None if the index cannot be used
         """
-        # Check rating range
-        rating = puzzle.get("rating", 0)
-        if min_rating is not None and rating < min_rating:
-            return False
-        if max_rating is not None and rating > max_rating:
-            return False
-        
-        # Check themes
-        puzzle_themes = puzzle.get("themes", [])
-        if themes:
-            if not any(theme in puzzle_themes for theme in themes):
-                return False
-        
-        # Check mate-in value
-        if mate_in is not None:
-            mate_theme = f"mateIn{mate_in}"
-            if mate_theme not in puzzle_themes:
-                return False
-        
-        # Check ply count
-        if ply_values is not None:
-            moves = puzzle.get("moves", [])
-            # The first move is the opponent's move that leads to the position
-            # The remaining moves are the solution
-            solution_ply_count = len(moves) - 1
-            if solution_ply_count not in ply_values:
-                return False
-        
-        return True
+        if criteria.themes:
+            themes = sorted(criteria.themes)
+        elif criteria.mate_tag is not None:
+            themes = [criteria.mate_tag]
+        else:
+            themes = sorted(criteria.mate_tags or ())
+        if not themes and not criteria.ply_values:
+            return None
         
+        index = PuzzleIndex(self.csv_path)
+        try:
+            if not index.is_current():
+                index.build(mm)
+            offsets = index.offsets(themes, criteria.ply_values, criteria.min_rating, criteria.max_rating)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Puzzle index unavailable, scanning CSV instead: %s", e)
+            return None
+        
+        return (line_at(mm, offset) for offset in random_order(offsets))
+    
     def _parse_row(self, row: List[str]) -> Dict[str, Any]:
         """
         Parse a row from the CSV file into a puzzle dictionary.
@@ -170,15 +196,15 @@ class PuzzleCSVParser:
             A puzzle dictionary
         """
         if len(row) < 8:  # Ensure we have at least the minimum required fields
-            logger.warning(f"Invalid row format: {row}")
+            logger.warning("Invalid row format: %s", row)
             return {}
             
         # Extract fields based on the CSV format from the readme
         puzzle_id = row[0]
         fen = row[1]
-        moves = row[2].split() if row[2] else []
-        rating = int(row[3]) if row[3].isdigit() else 0
-        themes = row[7].split() if len(row) > 7 and row[7] else []
+        moves = row[2].split()
+        rating = row_rating(row)
+        themes = row[7].split()
         game_url = row[8] if len(row) > 8 else ""
         
         # Create a puzzle dictionary
@@ -192,4 +218,15 @@ class PuzzleCSVParser:
             "url": game_url
         }
         
-        return puzzle 
\ No newline at end of file
+        return puzzle
+
+def _worker_count() -> int:
+    """
+    Count the CPUs this process may run on.
+    
+    Returns:
+        Number of usable CPUs
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
@@ -0,0 +1,208 @@
+"""
+Module for selecting and sampling raw rows of the Lichess puzzle database.
+"""
+
+import csv
+import mmap
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from puzzle_extractor.csv_scan import candidate_lines
+from puzzle_extractor.sampling import GroupSampler
+
+class RowCriteria(NamedTuple):
+    """Selection criteria checked against the raw fields of a CSV row."""
+    mate_tag: Optional[str] = None
+    themes: Optional[FrozenSet[str]] = None
+    ply_values: Optional[Sequence[int]] = None
+    min_rating: Optional[int] = None
+    max_rating: Optional[int] = None
+    mate_tags: Optional[FrozenSet[str]] = None
+
+def scan_needles(
+    mate_in: Optional[int],
+    themes: Optional[Sequence[str]],
+    mate_values: Optional[Sequence[int]]
+) -> List[bytes]:
+    """
+    Work out the byte strings a matching row must contain.
+
+    A row can only match if it contains at least one of the returned
+    needles, which lets the scan skip every other line without parsing it.
+
+    Args:
+        mate_in: Required mate-in-M value
+        themes: Required tactical themes
+        mate_values: Allowed mate-in values
+
+    Returns:
+        List of needles, or an empty list if every row must be parsed
+    """
+    if themes:
+        return [theme.encode('utf-8') for theme in themes]
+    if mate_in is not None:
+        return [f"mateIn{mate_in}".encode('utf-8')]
+    if mate_values:
+        if len(mate_values) > 1:
+            # One pass for the shared prefix beats one pass per mate value;
+            # the row check then picks the requested values
+            return [b"mateIn"]
+        return [f"mateIn{mate_values[0]}".encode('utf-8')]
+    return []
+
+def split_row(line: bytes) -> List[str]:
+    """
+    Split a raw CSV line into its fields.
+
+    Lichess puzzle rows never quote their fields, so a plain split is
+    enough; a line with quotes still goes through the csv module.
+
+    Args:
+        line: Raw CSV line, with or without its line ending
+
+    Returns:
+        List of fields
+    """
+    text = line.decode('utf-8').rstrip('\r\n')
+    if '"' in text:
+        return next(csv.reader([text]), [])
+    return text.split(',')
+
+def row_rating(row: List[str]) -> int:
+    """
+    Parse the rating of a raw CSV row.
+
+    Args:
+        row: A row from the CSV file
+
+    Returns:
+        The puzzle rating, or 0 if the field is not a number
+    """
+    try:
+        return int(row[3])
+    except ValueError:
+        return 0
+
+def row_ply(row: List[str]) -> int:
+    """
+    Count the solution plies of a raw CSV row.
+
+    The first move is the opponent's move that leads to the position and
+    the remaining moves are the solution, so the number of separators
+    equals the solution ply count.
+
+    Args:
+        row: A row from the CSV file
+
+    Returns:
+        The solution ply count, or -1 if the row has no moves
+    """
+    return row[2].count(" ") if row[2] else -1
+
+def row_matches(row: List[str], criteria: RowCriteria) -> bool:
+    """
+    Check if a raw CSV row matches all specified criteria.
+
+    The checks run on the unparsed fields, cheapest first, so rows that
+    are rejected never have their moves or themes split into lists.
+
+    Args:
+        row: A row from the CSV file
+        criteria: Criteria the row must match
+
+    Returns:
+        True if the row matches all criteria
+    """
+    if len(row) < 8:
+        return False
+
+    mate_tag, themes, ply_values, min_rating, max_rating, mate_tags = criteria
+
+    # Check rating range
+    rating = row_rating(row)
+    if min_rating is not None and rating < min_rating:
+        return False
+    if max_rating is not None and rating > max_rating:
+        return False
+
+    # Check ply count
+    if ply_values is not None and row_ply(row) not in ply_values:
+        return False
+
+    if not themes and mate_tag is None and not mate_tags:
+        return True
+
+    # A substring test on the raw field rejects most rows without
+    # splitting it; the split below makes the match exact
+    if mate_tag is not None and mate_tag not in row[7]:
+        return False
+
+    # Check themes
+    puzzle_themes = row[7].split()
+    if themes and themes.isdisjoint(puzzle_themes):
+        return False
+
+    # Check mate-in value
+    if mate_tag is not None and mate_tag not in puzzle_themes:
+        return False
+
+    # Check mate values
+    if mate_tags and mate_tags.isdisjoint(puzzle_themes):
+        return False
+
+    return True
+
+def sample_lines(
+    lines: Iterator[bytes],
+    criteria: RowCriteria,
+    sample_sizes: Dict[bool, int],
+    mate_themes: FrozenSet[str],
+    stop_when_full: bool = False
+) -> GroupSampler:
+    """
+    Keep a uniform random sample of the lines that match the criteria.
+
+    Only the raw rows are sampled; dictionaries are built later for the
+    rows that survive.
+
+    Args:
+        lines: Raw CSV lines
+        criteria: Criteria a row must match
+        sample_sizes: Number of rows to sample for each group
+        mate_themes: Themes that put a row in the mate group
+        stop_when_full: Stop reading once every sample is full
+
+    Returns:
+        The sampled rows
+    """
+    sampler = GroupSampler(sample_sizes)
+    for line in lines:
+        row = split_row(line)
+        if not row or row[0].lower() == 'puzzleid':  # Skip empty rows and the header
+            continue
+
+        if not row_matches(row, criteria):
+            continue
+
+        group = bool(mate_themes) and not mate_themes.isdisjoint(row[7].split())
+        sampler.add(group, row)
+        if stop_when_full and sampler.is_full():
+            break
+    return sampler
+
+def sample_chunk(task: Tuple) -> GroupSampler:
+    """
+    Sample the matching rows of one chunk of the CSV file.
+
+    Runs in a worker process, so the file is mapped again here.
+
+    Args:
+        task: Tuple of (csv_path, start, end, needles, criteria, sample_sizes, mate_themes)
+
+    Returns:
+        The sampled rows of the chunk
+    """
+    csv_path, start, end, needles, criteria, sample_sizes, mate_themes = task
+    with open(csv_path, 'rb') as file, \
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        lines = (line for _, line in candidate_lines(mm, needles, start, end))
+        return sample_lines(lines, criteria, sample_sizes, mate_themes)
@@ -0,0 +1,106 @@
+"""
+Module for scanning lines of the memory-mapped Lichess puzzle database.
+"""
+
+import mmap
+from typing import Iterator, List, Optional, Tuple
+
+def candidate_lines(
+    mm: mmap.mmap,
+    needles: List[bytes],
+    start: int = 0,
+    end: Optional[int] = None
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Yield the lines of the memory-mapped file that contain any needle.
+
+    Searching the mapped file for the needles runs in C, so lines that
+    cannot match are never copied into Python objects.
+
+    Args:
+        mm: Memory-mapped CSV file
+        needles: Byte strings a candidate line must contain
+        start: Byte offset of the first line to scan
+        end: Byte offset just past the last line to scan (default: end of file)
+
+    Yields:
+        Tuples of (byte offset, line) for the candidate lines, or for
+        every line if there are no needles
+    """
+    size = len(mm) if end is None else end
+    advise_sequential(mm)
+    if not needles:
+        offset = start
+        mm.seek(start)
+        while offset < size:
+            line = mm.readline()
+            if not line:
+                return
+            yield offset, line
+            offset += len(line)
+        return
+
+    next_hits = [mm.find(needle, start, size) for needle in needles]
+    while True:
+        hits = [hit for hit in next_hits if hit >= 0]
+        if not hits:
+            return
+
+        hit = min(hits)
+        line_start = mm.rfind(b"\n", 0, hit) + 1
+        line_end = mm.find(b"\n", hit, size)
+        if line_end < 0:
+            line_end = size
+        yield line_start, mm[line_start:line_end]
+
+        # Move every needle that hit this line past it
+        for i, needle_hit in enumerate(next_hits):
+            if 0 <= needle_hit <= line_end:
+                next_hits[i] = mm.find(needles[i], line_end + 1, size)
+
+def advise_sequential(mm: mmap.mmap) -> None:
+    """
+    Tell the kernel the mapped file is about to be read front to back.
+
+    This lets it read ahead in large blocks. Platforms without
+    madvise (Windows, Python before 3.8) simply skip the hint.
+
+    Args:
+        mm: Memory-mapped CSV file
+    """
+    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+
+def chunk_bounds(mm: mmap.mmap, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split the memory-mapped file into chunks of whole lines.
+
+    Args:
+        mm: Memory-mapped CSV file
+        parts: Number of chunks to aim for
+
+    Returns:
+        List of (start, end) byte offsets, one per non-empty chunk
+    """
+    size = len(mm)
+    starts = [0]
+    for i in range(1, parts):
+        newline = mm.find(b"\n", size * i // parts)
+        start = size if newline < 0 else newline + 1
+        if start > starts[-1]:
+            starts.append(start)
+    return [(s, e) for s, e in zip(starts, starts[1:] + [size]) if s < e]
+
+def line_at(mm: mmap.mmap, offset: int) -> bytes:
+    """
+    Read the line starting at a byte offset of the memory-mapped file.
+
+    Args:
+        mm: Memory-mapped CSV file
+        offset: Byte offset of the start of the line
+
+    Returns:
+        The line without its newline
+    """
+    end = mm.find(b"\n", offset)
+    return mm[offset:end if end >= 0 else len(mm)]
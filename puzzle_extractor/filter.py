@@ -37,9 +37,13 @@ class PuzzleFilter:
         Returns:
             Filtered list of puzzles
         """
-        logger.info(f"Filtering {len(puzzles)} puzzles")
+        logger.info("Filtering %s puzzles", len(puzzles))
         
-        # Track unique puzzles by FEN to ensure variety
+        # Build the theme criteria once instead of per puzzle
+        required_themes = frozenset(themes) if themes else None
+        mate_themes = frozenset(f"mateIn{m}" for m in mate_values) if mate_values else None
+        
+        # Track unique puzzles by ID to ensure variety
         unique_puzzles = {}
         for puzzle in puzzles:
             puzzle_id = puzzle.get("id", "")
@@ -50,6 +54,11 @@ class PuzzleFilter:
             if not puzzle_fen or not puzzle_id or not moves:
                 continue
             
+            # Skip duplicates before doing any of the board work; the ID
+            # identifies the position
+            if puzzle_id in unique_puzzles:
+                continue
+            
             # Check rating range if specified
             rating = puzzle.get("rating", 0)
             if min_rating is not None and rating < min_rating:
@@ -59,7 +68,7 @@ class PuzzleFilter:
             
             # Check themes if specified
             puzzle_themes = puzzle.get("themes", [])
-            if themes and not any(theme in puzzle_themes for theme in themes):
+            if required_themes and required_themes.isdisjoint(puzzle_themes):
                 continue
             
             # Check ply count if specified
@@ -71,33 +80,20 @@ class PuzzleFilter:
                 continue
             
             # Check mate values if specified
-            if mate_values:
-                mate_theme_found = False
-                for mate_in in mate_values:
-                    if f"mateIn{mate_in}" in puzzle_themes:
-                        mate_theme_found = True
-                        break
-                if not mate_theme_found:
-                    continue
-            
-            # Process the puzzle data for proper presentation
-            processed_puzzle = self._process_puzzle(puzzle)
-            
-            # Use both ID and FEN as a key to ensure uniqueness
-            key = f"{puzzle_id}_{processed_puzzle['fen']}"
+            if mate_themes and mate_themes.isdisjoint(puzzle_themes):
+                continue
             
-            if key not in unique_puzzles:
-                unique_puzzles[key] = processed_puzzle
+            unique_puzzles[puzzle_id] = puzzle
         
-        filtered_puzzles = list(unique_puzzles.values())
-        logger.info(f"Found {len(filtered_puzzles)} unique puzzles matching criteria")
+        matches = list(unique_puzzles.values())
+        logger.info("Found %s unique puzzles matching criteria", len(matches))
         
         # Randomly select up to 'count' puzzles
-        if len(filtered_puzzles) > count:
-            random.shuffle(filtered_puzzles)
-            filtered_puzzles = filtered_puzzles[:count]
-            
-        return filtered_puzzles
+        if len(matches) > count:
+            matches = random.sample(matches, count)
+        
+        # Only the selected puzzles need the board work for presentation
+        return [self._process_puzzle(puzzle) for puzzle in matches]
     
     def filter_mate_puzzles(
         self, 
@@ -171,8 +167,9 @@ class PuzzleFilter:
             # The solution starts from the second move
             player_moves = moves[1:]
             
-            # Convert solution moves to algebraic notation
-            processed["solution"] = self._convert_to_algebraic(player_moves, board.fen())
+            # Convert solution moves to algebraic notation, continuing on the
+            # same board instead of parsing its FEN again
+            processed["solution"] = self._convert_to_algebraic(player_moves, board=board)
             
             # Store the ply count (number of moves in the solution)
             processed["ply_count"] = len(player_moves)
@@ -180,22 +177,36 @@ class PuzzleFilter:
             return processed
             
         except Exception as e:
-            logger.warning(f"Error processing puzzle: {e}")
+            logger.warning("Error processing puzzle: %s", e)
             return processed
     
-    def _convert_to_algebraic(self, moves: List[str], fen: str) -> List[str]:
+    def _convert_to_algebraic(
+        self,
+        moves: List[str],
+        fen: Optional[str] = None,
+        board: Optional[chess.Board] = None
+    ) -> List[str]:
         """
         Convert UCI moves to algebraic notation.
         
         Args:
             moves: List of moves in UCI format
             fen: The starting position in FEN format
+            board: Board at the starting position, used instead of fen; the
+                moves are played on it
             
         Returns:
             List of moves in algebraic notation
+            
+        Raises:
+            ValueError: If neither fen nor board is given
         """
+        if fen is None and board is None:
+            raise ValueError("Either fen or board is required")
+        
         try:
-            board = chess.Board(fen)
+            if board is None:
+                board = chess.Board(fen)
             algebraic_moves = []
             
             for move_str in moves:
@@ -206,5 +217,5 @@ class PuzzleFilter:
             return algebraic_moves
             
         except Exception as e:
-            logger.warning(f"Error converting moves to algebraic notation: {e}")
+            logger.warning("Error converting moves to algebraic notation: %s", e)
             return moves  # Return original moves if conversion fails 
\ No newline at end of file
@@ -3,14 +3,25 @@ Module for generating LaTeX documents from chess puzzles.
 """
 
 import logging
-import os
-import re
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 
+from puzzle_extractor.latex_templates import (
+    BOARD_AFTER_FEN,
+    BOARD_BEFORE_FEN,
+    BOARD_SETTINGS,
+    BOOK_PREAMBLE,
+    DOCUMENT_START,
+    PREAMBLE_START,
+    STANDARD_PREAMBLE_HEAD,
+    STANDARD_PREAMBLE_TAIL,
+)
 from puzzle_extractor.themes import format_theme_list
 
 logger = logging.getLogger(__name__)
 
+# Backslash-escapes for the LaTeX special characters that can occur in moves
+_LATEX_ESCAPES = str.maketrans({c: "\\" + c for c in "#$%&_{}"})
+
 class LaTeXGenerator:
     """Generate LaTeX documents from chess puzzles."""
     
@@ -48,10 +59,11 @@ class LaTeXGenerator:
             ply_values: List of ply counts for tactical puzzles
             book_format: Whether to use pocket book format
         """
-        logger.info(f"Generating LaTeX document with {len(puzzles)} puzzles")
+        logger.info("Generating LaTeX document with %s puzzles", len(puzzles))
         
-        # Create the LaTeX content
-        latex_content = self._create_latex_content(
+        # Stream the LaTeX lines to the file instead of building the whole
+        # document in memory first
+        lines = self._iter_latex_lines(
             puzzles, 
             title, 
             mate_in, 
@@ -65,14 +77,14 @@ class LaTeXGenerator:
             ply_values,
             book_format
         )
+        with open(output_file, "w", buffering=1 << 20, encoding="utf-8", newline="\n") as f:
+            f.write(next(lines))
+            for line in lines:
+                f.write("\n" + line)
         
-        # Write to file
-        with open(output_file, "w") as f:
-            f.write(latex_content)
-        
-        logger.info(f"LaTeX document written to {output_file}")
+        logger.info("LaTeX document written to %s", output_file)
     
-    def _create_latex_content(
+    def _iter_latex_lines(
         self, 
         puzzles: List[Dict[str, Any]], 
         title: str,
@@ -86,9 +98,9 @@ class LaTeXGenerator:
         themes: Optional[List[str]] = None,
         ply_values: Optional[List[int]] = None,
         book_format: bool = True
-    ) -> str:
+    ) -> Iterator[str]:
         """
-        Create the LaTeX content for the document.
+        Generate the lines of the LaTeX document.
         
         Args:
             puzzles: List of puzzles to include in the document
@@ -104,89 +116,27 @@ class LaTeXGenerator:
             ply_values: List of ply counts for tactical puzzles
             book_format: Whether to use pocket book format
             
-        Returns:
-            LaTeX content as a string
+        Yields:
+            Lines, or blocks of lines, of LaTeX content
         """
         # LaTeX preamble with adjusted settings for pocket book format
-        latex = [
-            r"\documentclass[10pt]{article}",
-            r"\usepackage[utf8]{inputenc}",
-            r"\usepackage{xskak}",
-            r"\usepackage{chessboard}",
-        ]
-
+        yield PREAMBLE_START
         if book_format:
-            # Pocket book format settings
-            latex.extend([
-                r"\usepackage[",
-                r"    paperwidth=4.25in,",
-                r"    paperheight=6.875in,",
-                r"    top=0.5in,",
-                r"    bottom=0.5in,",
-                r"    left=0.5in,",
-                r"    right=0.5in",
-                r"]{geometry}",
-                r"\usepackage{lmodern}",
-                r"\usepackage{fancyhdr}",
-                r"\usepackage{titlesec}",
-                r"\usepackage{parskip}",
-                r"\usepackage{caption}",
-                r"\usepackage{newpxtext,newpxmath}",  # Better print font
-                r"",
-                r"% Optional: No page numbers or headers",
-                r"\pagestyle{empty}",
-                r"",
-                r"% Optional: Remove section numbers",
-                r"\titleformat{\section}[block]{\bfseries\large\filcenter}{}{0pt}{}",
-            ])
+            yield BOOK_PREAMBLE
         else:
-            # Standard format settings
-            latex.extend([
-                r"\usepackage[margin=0.75in]{geometry}",
-                r"\usepackage{multicol}",
-                r"\usepackage{titlesec}",
-                r"\usepackage{fancyhdr}",
-                r"\usepackage{lastpage}",
-                r"\usepackage{enumitem}",
-                r"\usepackage{paracol}",
-                r"",
-                r"\setlength{\parindent}{0pt}",
-                r"\setlength{\parskip}{6pt}",
-                r"",
-                r"% Increase headheight to avoid fancyhdr warning",
-                r"\setlength{\headheight}{15pt}",
-                r"",
-                r"\pagestyle{fancy}",
-                r"\fancyhf{}",
-                r"\fancyhead[L]{\slshape " + title + r"}",
-                r"\fancyhead[R]{\slshape Page \thepage\ of \pageref{LastPage}}",
-                r"\renewcommand{\headrulewidth}{0.4pt}",
-                r"\renewcommand{\footrulewidth}{0.4pt}",
-            ])
-
+            yield STANDARD_PREAMBLE_HEAD
+            yield rf"\fancyhead[L]{{\slshape {title}}}"
+            yield STANDARD_PREAMBLE_TAIL
+        
         # Common settings
-        latex.extend([
-            r"% Settings for the chess board",
-            r"\setchessboard{",
-            r"    boardfontsize=14pt,",  # Adjusted for pocket book
-            r"    showmover=true,",
-            r"    moverstyle=square,",
-            r"    label=false,",
-            r"    labelleft=false,",
-            r"    labelbottom=false,",
-            r"    labeltop=false,",
-            r"    labelright=false",
-            r"}",
-            r"",
-            r"\title{" + title + r"}",
-            r"\author{}",
-            r"\date{\today}",
-            r"",
-            r"\begin{document}",
-            r"",
-            r"\maketitle",
-            r"",
-        ])
+        yield BOARD_SETTINGS
+        yield rf"\title{{{title}}}"
+        yield DOCUMENT_START
+        
+        # Compute the summaries once for both the instructions and the parameters
+        theme_list = format_theme_list(themes) if themes else None
+        if ply_values:
+            ply_min, ply_max = min(ply_values), max(ply_values)
         
         # Create instructions based on puzzle type
         instructions = [
@@ -195,12 +145,12 @@ class LaTeXGenerator:
         ]
         
         if themes:
-            instructions.append(f"Each puzzle features one or more of the following tactical themes: {format_theme_list(themes)}.")
+            instructions.append(f"Each puzzle features one or more of the following tactical themes: {theme_list}.")
         elif ply_values:
             if len(ply_values) == 1:
                 instructions.append(f"Each puzzle requires {ply_values[0]//2} moves to reach the winning position.")
             else:
-                instructions.append(f"Each puzzle requires between {min(ply_values)//2} and {max(ply_values)//2} moves to reach the winning position.")
+                instructions.append(f"Each puzzle requires between {ply_min//2} and {ply_max//2} moves to reach the winning position.")
         elif mate_values:
             if len(mate_values) == 1:
                 instructions.append(f"For each puzzle, find the sequence of moves that leads to checkmate in {mate_values[0]} moves.")
@@ -216,17 +166,17 @@ class LaTeXGenerator:
         
         # Add puzzle type information
         if themes:
-            instructions.append(f"\\item \\textbf{{Themes}}: {format_theme_list(themes)}")
+            instructions.append(f"\\item \\textbf{{Themes}}: {theme_list}")
         elif ply_values:
             if len(ply_values) == 1:
                 instructions.append(f"\\item \\textbf{{Solution length}}: {ply_values[0]//2} moves ({ply_values[0]} ply)")
             else:
-                instructions.append(f"\\item \\textbf{{Solution length}}: {min(ply_values)//2} to {max(ply_values)//2} moves ({min(ply_values)} to {max(ply_values)} ply)")
+                instructions.append(f"\\item \\textbf{{Solution length}}: {ply_min//2} to {ply_max//2} moves ({ply_min} to {ply_max} ply)")
         elif mate_values:
             if len(mate_values) == 1:
                 instructions.append(f"\\item \\textbf{{Mate-in}}: All puzzles are mate-in-{mate_values[0]}")
             else:
-                instructions.append(f"\\item \\textbf{{Mate-in}}: Mixed set containing mate-in " + ", ".join([str(m) for m in mate_values]))
+                instructions.append(f"\\item \\textbf{{Mate-in}}: Mixed set containing mate-in " + ", ".join(map(str, mate_values)))
         
         # Add rating range if provided
         if min_rating and max_rating:
@@ -253,62 +203,63 @@ class LaTeXGenerator:
             r"",
         ])
         
-        latex.extend(instructions)
-        latex.append(r"\newpage")
+        yield from instructions
+        yield r"\newpage"
 
         if book_format:
             # Vertical layout for pocket book format
             for i in range(0, len(puzzles), 2):
                 # First puzzle
-                latex.extend(self._create_puzzle_section(puzzles[i], i + 1, hide_ratings))
-                latex.append(r"\vspace{1cm}")
+                yield self._create_puzzle_section(puzzles[i], i + 1, hide_ratings)
+                yield r"\vspace{1cm}"
                 
                 # Second puzzle (if it exists)
                 if i + 1 < len(puzzles):
-                    latex.extend(self._create_puzzle_section(puzzles[i + 1], i + 2, hide_ratings))
+                    yield self._create_puzzle_section(puzzles[i + 1], i + 2, hide_ratings)
                 
-                latex.append(r"\newpage")
+                yield r"\newpage"
         else:
             # Original 2x2 grid layout
-            latex.extend([
+            yield from (
                 r"\begin{paracol}{2}",
                 r"\setlength{\columnsep}{20pt}",
                 r"",
-            ])
+            )
             
+            # Each pair of puzzles is one block, with a column switch after each
             for i in range(0, len(puzzles), 2):
-                latex.extend(self._create_puzzle_section(puzzles[i], i + 1, hide_ratings))
-                latex.append(r"\switchcolumn")
-                
+                pair = self._create_puzzle_section(puzzles[i], i + 1, hide_ratings) + "\n\\switchcolumn\n"
                 if i + 1 < len(puzzles):
-                    latex.extend(self._create_puzzle_section(puzzles[i + 1], i + 2, hide_ratings))
-                    latex.append(r"\switchcolumn")
-                
-                latex.append("")
+                    pair += self._create_puzzle_section(puzzles[i + 1], i + 2, hide_ratings) + "\n\\switchcolumn\n"
+                yield pair
             
-            latex.extend([
+            yield from (
                 r"\end{paracol}",
                 r"",
                 r"\newpage",
-            ])
+            )
 
         # Add solutions section
-        latex.extend([
+        yield from (
             r"\section*{Solutions}",
             r"",
-        ])
+        )
         
+        # One block per solution: the puzzle number, the moves and a blank line
         for i, puzzle in enumerate(puzzles, 1):
-            latex.extend(self._create_solution_section(puzzle, i))
+            solution = puzzle.get("solution", [])
+            if solution:
+                # The separators need no escaping, so the joined list is escaped in one pass
+                yield f"\\textbf{{Puzzle {i}:}}\n{self._escape_chess_notation(', '.join(solution))}\n"
+            else:
+                yield f"\\textbf{{Puzzle {i}:}}\n"
         
-        latex.extend([
+        yield from (
             r"",
             r"\end{document}",
-        ])
-        
-        return "\n".join(latex)
+        )
     
-    def _create_puzzle_section(self, puzzle: Dict[str, Any], puzzle_num: int, hide_ratings: bool) -> List[str]:
+    def _create_puzzle_section(self, puzzle: Dict[str, Any], puzzle_num: int, hide_ratings: bool) -> str:
         """
         Create the LaTeX content for a single puzzle section.
         
@@ -318,67 +269,30 @@ class LaTeXGenerator:
             hide_ratings: Whether to hide puzzle ratings
             
         Returns:
-            List of LaTeX lines for the puzzle section
+            LaTeX lines for the puzzle section, ending with a blank line
         """
-        latex = []
-        
         # Add puzzle number and rating
-        puzzle_header = f"Puzzle {puzzle_num}"
-        if not hide_ratings:
-            rating = puzzle.get("rating", 0)
-            puzzle_header += f" (Rating: {rating})"
-        latex.append(r"\subsection*{" + puzzle_header + r"}")
+        if hide_ratings:
+            header = f"\\subsection*{{Puzzle {puzzle_num}}}\n"
+        else:
+            header = f"\\subsection*{{Puzzle {puzzle_num} (Rating: {puzzle.get('rating', 0)})}}\n"
         
         # Add the chess position
         fen = puzzle.get("fen", "")
-        if fen:
-            # Set mover based on whose turn it is (2 for White, 1 for Black)
-            mover = "2" if "w" in fen else "1"
-            latex.extend([
-                r"\begin{center}",
-                r"\newchessgame",
-                r"\fenboard{" + fen + r"}",
-                r"\chessboard[showmover=true, boardfontsize=16pt]",  # Increased from 12pt to 16pt
-                r"\end{center}"
-            ])
-        
-        latex.append("")  # Add blank line for spacing
-        return latex
-    
-    def _create_solution_section(self, puzzle: Dict[str, Any], puzzle_num: int) -> List[str]:
-        """
-        Create the LaTeX content for a single puzzle's solution.
-        
-        Args:
-            puzzle: Puzzle data dictionary
-            puzzle_num: Puzzle number
-            
-        Returns:
-            List of LaTeX lines for the solution section
-        """
-        latex = []
-        
-        # Add puzzle number
-        latex.append(f"\\textbf{{Puzzle {puzzle_num}:}}")
-        
-        # Add solution moves
-        solution = puzzle.get("solution", [])
-        if solution:
-            latex.append(", ".join(self._escape_chess_notation(move) for move in solution))
+        if not fen:
+            return header
         
-        latex.append("")  # Add blank line for spacing
-        return latex
+        return header + BOARD_BEFORE_FEN + fen + BOARD_AFTER_FEN
     
-    def _escape_chess_notation(self, move: str) -> str:
+    def _escape_chess_notation(self, notation: str) -> str:
         """
         Escape special characters in chess notation for LaTeX.
         
         Args:
-            move: Chess move in algebraic notation
+            notation: Chess moves in algebraic notation
             
         Returns:
-            Escaped move string
+            Escaped notation string
         """
         # Escape special LaTeX characters
-        move = re.sub(r"([#\$%&_\{\}])", r"\\\1", move)
-        return move 
\ No newline at end of file
+        return notation.translate(_LATEX_ESCAPES) 
\ No newline at end of file
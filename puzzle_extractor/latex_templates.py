@@ -0,0 +1,100 @@
+"""
+Module with the fixed parts of the generated LaTeX documents.
+"""
+
+# Opening lines of every document
+PREAMBLE_START = "\n".join([
+    r"\documentclass[10pt]{article}",
+    r"\usepackage[utf8]{inputenc}",
+    r"\usepackage{xskak}",
+    r"\usepackage{chessboard}",
+])
+
+# Pocket book format settings
+BOOK_PREAMBLE = "\n".join([
+    r"\usepackage[",
+    r"    paperwidth=4.25in,",
+    r"    paperheight=6.875in,",
+    r"    top=0.5in,",
+    r"    bottom=0.5in,",
+    r"    left=0.5in,",
+    r"    right=0.5in",
+    r"]{geometry}",
+    r"\usepackage{lmodern}",
+    r"\usepackage{fancyhdr}",
+    r"\usepackage{titlesec}",
+    r"\usepackage{parskip}",
+    r"\usepackage{caption}",
+    r"\usepackage{newpxtext,newpxmath}",  # Better print font
+    r"",
+    r"% Optional: No page numbers or headers",
+    r"\pagestyle{empty}",
+    r"",
+    r"% Optional: Remove section numbers",
+    r"\titleformat{\section}[block]{\bfseries\large\filcenter}{}{0pt}{}",
+])
+
+# Standard format settings, before and after the header line with the title
+STANDARD_PREAMBLE_HEAD = "\n".join([
+    r"\usepackage[margin=0.75in]{geometry}",
+    r"\usepackage{multicol}",
+    r"\usepackage{titlesec}",
+    r"\usepackage{fancyhdr}",
+    r"\usepackage{lastpage}",
+    r"\usepackage{enumitem}",
+    r"\usepackage{paracol}",
+    r"",
+    r"\setlength{\parindent}{0pt}",
+    r"\setlength{\parskip}{6pt}",
+    r"",
+    r"% Increase headheight to avoid fancyhdr warning",
+    r"\setlength{\headheight}{15pt}",
+    r"",
+    r"\pagestyle{fancy}",
+    r"\fancyhf{}",
+])
+STANDARD_PREAMBLE_TAIL = "\n".join([
+    r"\fancyhead[R]{\slshape Page \thepage\ of \pageref{LastPage}}",
+    r"\renewcommand{\headrulewidth}{0.4pt}",
+    r"\renewcommand{\footrulewidth}{0.4pt}",
+])
+
+# Settings for the chess board
+BOARD_SETTINGS = "\n".join([
+    r"% Settings for the chess board",
+    r"\setchessboard{",
+    r"    boardfontsize=14pt,",  # Adjusted for pocket book
+    r"    showmover=true,",
+    r"    moverstyle=square,",
+    r"    label=false,",
+    r"    labelleft=false,",
+    r"    labelbottom=false,",
+    r"    labeltop=false,",
+    r"    labelright=false",
+    r"}",
+    r"",
+])
+
+# Lines between the title and the instructions
+DOCUMENT_START = "\n".join([
+    r"\author{}",
+    r"\date{\today}",
+    r"",
+    r"\begin{document}",
+    r"",
+    r"\maketitle",
+    r"",
+])
+
+# Diagram of a puzzle position, split around its FEN
+BOARD_BEFORE_FEN = "\n".join([
+    r"\begin{center}",
+    r"\newchessgame",
+    r"\fenboard{",
+])
+BOARD_AFTER_FEN = "\n".join([
+    r"}",
+    r"\chessboard[showmover=true, boardfontsize=16pt]",  # Increased from 12pt to 16pt
+    r"\end{center}",
+    r"",
+])
@@ -127,6 +127,14 @@ MATE_PUZZLES = {
     3: MATE_IN_3_PUZZLES
 }
 
+def _ensure_solutions() -> None:
+    """Ensure each puzzle has a "solution" field, once at import rather than per call."""
+    for puzzles in MATE_PUZZLES.values():
+        for puzzle in puzzles:
+            puzzle.setdefault("solution", puzzle["moves"].copy())
+
+_ensure_solutions()
+
 def get_mate_puzzles(mate_in: int, count: int) -> list:
     """
     Get predefined mate-in-M puzzles.
@@ -136,21 +144,11 @@ def get_mate_puzzles(mate_in: int, count: int) -> list:
         count: Number of puzzles to return
         
     Returns:
-        List of puzzles
+        List of puzzles in random order
     """
     if mate_in in MATE_PUZZLES:
-        puzzles = MATE_PUZZLES[mate_in].copy()  # Make a copy to avoid modifying the original
-        
-        # Ensure each puzzle has a "solution" field
-        for puzzle in puzzles:
-            if "solution" not in puzzle:
-                puzzle["solution"] = puzzle["moves"].copy()
-        
-        # Shuffle the puzzles to ensure variety
-        random.shuffle(puzzles)
+        puzzles = MATE_PUZZLES[mate_in]
         
-        if len(puzzles) >= count:
-            return puzzles[:count]
-        else:
-            return puzzles
-    return [] 
\ No newline at end of file
+        # Sample without copying and shuffling the whole list
+        return random.sample(puzzles, min(count, len(puzzles)))
+    return []
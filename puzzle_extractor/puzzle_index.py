@@ -0,0 +1,165 @@
+"""
+Module for the on-disk index of the Lichess puzzle database.
+"""
+
+import logging
+import mmap
+import os
+import sqlite3
+from contextlib import closing
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from puzzle_extractor.csv_rows import row_ply, row_rating, split_row
+from puzzle_extractor.csv_scan import candidate_lines
+
+logger = logging.getLogger(__name__)
+
+# Suffix of the index file stored next to the CSV database
+INDEX_SUFFIX = ".idx"
+
+# Version of the index layout; indexes with another version are rebuilt
+INDEX_VERSION = 3
+
+class PuzzleIndex:
+    """Sidecar index mapping themes, ratings and ply counts to CSV byte offsets."""
+
+    def __init__(self, csv_path: str):
+        """
+        Initialize the index for a CSV database.
+
+        Args:
+            csv_path: Path to the Lichess puzzle database CSV file
+        """
+        self.csv_path = csv_path
+        self.index_path = csv_path + INDEX_SUFFIX
+
+    def is_current(self) -> bool:
+        """
+        Check whether the index exists and was built from the current CSV file.
+
+        Returns:
+            True if the index can be used
+        """
+        if not os.path.exists(self.index_path):
+            return False
+
+        try:
+            with closing(sqlite3.connect(self.index_path)) as conn:
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                if version != INDEX_VERSION:
+                    return False
+                row = conn.execute("SELECT csv_size, csv_mtime FROM meta").fetchone()
+        except sqlite3.Error:
+            return False
+
+        return row == self._csv_signature()
+
+    def build(self, mm: mmap.mmap) -> None:
+        """
+        Build the index from the memory-mapped CSV file.
+
+        The index is written to a temporary file and moved into place, so an
+        interrupted build never leaves a partial index behind.
+
+        Args:
+            mm: Memory-mapped CSV file
+        """
+        logger.info("Building puzzle index %s", self.index_path)
+
+        tmp_path = self.index_path + ".tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        theme_ids = {}  # type: Dict[str, int]
+        with closing(sqlite3.connect(tmp_path)) as conn:
+            conn.execute("CREATE TABLE meta (csv_size INTEGER, csv_mtime INTEGER)")
+            conn.execute("CREATE TABLE puzzles (offset INTEGER PRIMARY KEY, rating INTEGER, ply INTEGER)")
+            conn.execute("CREATE TABLE themes (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+            conn.execute(
+                "CREATE TABLE puzzle_themes (theme_id INTEGER, offset INTEGER, "
+                "PRIMARY KEY (theme_id, offset)) WITHOUT ROWID"
+            )
+            for offset, rating, ply, themes in self._entries(mm):
+                conn.execute("INSERT INTO puzzles VALUES (?, ?, ?)", (offset, rating, ply))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO puzzle_themes VALUES (?, ?)",
+                    [(theme_ids.setdefault(theme, len(theme_ids)), offset) for theme in themes]
+                )
+            conn.executemany("INSERT INTO themes VALUES (?, ?)", [(i, name) for name, i in theme_ids.items()])
+            conn.execute("CREATE INDEX puzzle_rating ON puzzles (rating)")
+            conn.execute("INSERT INTO meta VALUES (?, ?)", self._csv_signature())
+            conn.execute(f"PRAGMA user_version = {INDEX_VERSION}")
+            conn.commit()
+
+        os.replace(tmp_path, self.index_path)
+
+    def offsets(
+        self,
+        themes: Optional[Sequence[str]] = None,
+        ply_values: Optional[Sequence[int]] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None
+    ) -> Tuple[int, ...]:
+        """
+        Look up the byte offsets of matching puzzles in file order.
+
+        Args:
+            themes: Themes of which a puzzle needs at least one (optional)
+            ply_values: Allowed solution ply counts (optional)
+            min_rating: Minimum puzzle rating (optional)
+            max_rating: Maximum puzzle rating (optional)
+
+        Returns:
+            Byte offsets of the matching CSV lines
+        """
+        conditions = []
+        params = []  # type: List
+        if themes:
+            conditions.append(
+                "offset IN (SELECT offset FROM puzzle_themes WHERE theme_id IN "
+                "(SELECT id FROM themes WHERE name IN ({})))".format(", ".join("?" for _ in themes))
+            )
+            params.extend(themes)
+        if ply_values:
+            conditions.append("ply IN ({})".format(", ".join("?" for _ in ply_values)))
+            params.extend(ply_values)
+        if min_rating is not None:
+            conditions.append("rating >= ?")
+            params.append(min_rating)
+        if max_rating is not None:
+            conditions.append("rating <= ?")
+            params.append(max_rating)
+
+        query = "SELECT offset FROM puzzles"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+
+        with closing(sqlite3.connect(self.index_path)) as conn:
+            return tuple(offset for (offset,) in conn.execute(query, params))
+
+    def _entries(self, mm: mmap.mmap) -> Iterator[Tuple[int, int, int, List[str]]]:
+        """
+        Yield the index entries for every puzzle in the CSV file.
+
+        Args:
+            mm: Memory-mapped CSV file
+
+        Yields:
+            Tuples of (byte offset, rating, solution ply count, themes)
+        """
+        for offset, line in candidate_lines(mm, []):
+            row = split_row(line)
+            if len(row) < 8 or row[0].lower() == "puzzleid":
+                continue
+
+            yield (offset, row_rating(row), row_ply(row), row[7].split())
+
+    def _csv_signature(self) -> Tuple[int, int]:
+        """
+        Get the size and modification time identifying the CSV file version.
+
+        Returns:
+            Tuple of (size, mtime in nanoseconds)
+        """
+        stat = os.stat(self.csv_path)
+        return (stat.st_size, stat.st_mtime_ns)
@@ -0,0 +1,107 @@
+"""
+Module for drawing uniform random samples of puzzle rows.
+"""
+
+import random
+from typing import Any, Dict, Hashable, Iterator, List, Sequence
+
+class GroupSampler:
+    """Reservoir samples of rows, kept separately for each group of puzzles."""
+
+    def __init__(self, sample_sizes: Dict[Hashable, int]):
+        """
+        Initialize empty samples.
+
+        Args:
+            sample_sizes: Number of rows to keep for each group
+        """
+        self.sample_sizes = sample_sizes
+        self.reservoirs = {group: [] for group in sample_sizes}
+        self.seen = dict.fromkeys(sample_sizes, 0)
+
+    def add(self, group: Hashable, row: Any) -> None:
+        """
+        Offer a row to the sample of its group.
+
+        Every row seen so far has the same chance of being in the sample
+        (Algorithm R), without keeping the rows that are dropped.
+
+        Args:
+            group: Group the row belongs to
+            row: The row to offer
+        """
+        reservoir = self.reservoirs[group]
+        size = self.sample_sizes[group]
+        self.seen[group] += 1
+        if len(reservoir) < size:
+            reservoir.append(row)
+        else:
+            j = random.randrange(self.seen[group])
+            if j < size:
+                reservoir[j] = row
+
+    def is_full(self) -> bool:
+        """
+        Check whether every group has a full sample.
+
+        Returns:
+            True if no group needs more rows
+        """
+        return all(len(self.reservoirs[g]) >= size for g, size in self.sample_sizes.items())
+
+def merge_samples(samplers: Sequence[GroupSampler], group: Hashable) -> List[Any]:
+    """
+    Combine the samples of one group taken over disjoint parts of the data.
+
+    Each pick comes from a part with probability proportional to the rows
+    of that part not picked yet, which makes the result a uniform sample
+    of all the rows, in random order.
+
+    Args:
+        samplers: Samplers that each saw a different part of the data
+        group: Group to combine
+
+    Returns:
+        The combined sample
+    """
+    pools = []
+    remaining = []
+    for sampler in samplers:
+        pool = list(sampler.reservoirs[group])
+        random.shuffle(pool)
+        pools.append(pool)
+        remaining.append(sampler.seen[group])
+
+    size = samplers[0].sample_sizes[group] if samplers else 0
+    sample = []
+    total = sum(remaining)
+    while len(sample) < size and total > 0:
+        pick = random.randrange(total)
+        for i, count in enumerate(remaining):
+            if pick < count:
+                break
+            pick -= count
+        sample.append(pools[i].pop())
+        remaining[i] -= 1
+        total -= 1
+    return sample
+
+def random_order(items: Sequence[Any]) -> Iterator[Any]:
+    """
+    Yield the items in random order, shuffling lazily.
+
+    This is a Fisher-Yates shuffle that only records the swapped positions,
+    so taking the first k items costs O(k) regardless of the sequence length.
+
+    Args:
+        items: Items to shuffle; the sequence itself is left unchanged
+
+    Yields:
+        Each item once, in random order
+    """
+    n = len(items)
+    swapped = {}  # type: Dict[int, int]
+    for i in range(n):
+        j = random.randrange(i, n)
+        yield items[swapped.get(j, j)]
+        swapped[j] = swapped.get(i, i)
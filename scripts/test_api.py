@@ -25,22 +25,19 @@ def main():
         # Fetch some puzzles
         mate_in = 2
         count = 3
-        logger.info(f"Fetching {count} mate-in-{mate_in} puzzles...")
+        logger.info("Fetching %s mate-in-%s puzzles...", count, mate_in)
         
         puzzles = api.fetch_puzzles(mate_in=mate_in, count=count)
         
         # Print the puzzles
-        logger.info(f"Successfully fetched {len(puzzles)} puzzles")
+        logger.info("Successfully fetched %s puzzles", len(puzzles))
         for i, puzzle in enumerate(puzzles, 1):
-            logger.info(f"Puzzle {i}:")
-            logger.info(f"  ID: {puzzle['id']}")
-            logger.info(f"  Rating: {puzzle['rating']}")
-            logger.info(f"  Moves: {puzzle['moves']}")
-            logger.info(f"  URL: {puzzle['url']}")
+            logger.info("Puzzle %s:\n  ID: %s\n  Rating: %s\n  Moves: %s\n  URL: %s",
+                        i, puzzle['id'], puzzle['rating'], puzzle['moves'], puzzle['url'])
         
         return 0
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
 
 if __name__ == "__main__":
@@ -31,7 +31,7 @@ def main():
         # Fetch and filter puzzles
         mate_in = 2
         count = 3
-        logger.info(f"Fetching and filtering {count} mate-in-{mate_in} puzzles...")
+        logger.info("Fetching and filtering %s mate-in-%s puzzles...", count, mate_in)
         
         raw_puzzles = api.fetch_puzzles(mate_in=mate_in, count=count)
         filtered_puzzles = puzzle_filter.filter_mate_puzzles(
@@ -43,7 +43,7 @@ def main():
         # Generate LaTeX document
         output_file = "end_to_end_test.tex"
         title = "End-to-End Test"
-        logger.info(f"Generating LaTeX document with {len(filtered_puzzles)} puzzles...")
+        logger.info("Generating LaTeX document with %s puzzles...", len(filtered_puzzles))
         
         latex_generator.generate_document(
             puzzles=filtered_puzzles,
@@ -54,11 +54,11 @@ def main():
         
         # Check if the file was created
         if not os.path.exists(output_file):
-            logger.error(f"Failed to generate LaTeX document: {output_file}")
+            logger.error("Failed to generate LaTeX document: %s", output_file)
             return 1
         
         # Try to compile the LaTeX document
-        logger.info(f"Attempting to compile the LaTeX document...")
+        logger.info("Attempting to compile the LaTeX document...")
         
         try:
             # Check if pdflatex is available
@@ -74,9 +74,9 @@ def main():
             
             pdf_file = output_file.replace(".tex", ".pdf")
             if os.path.exists(pdf_file):
-                logger.info(f"Successfully compiled LaTeX document to PDF: {pdf_file}")
+                logger.info("Successfully compiled LaTeX document to PDF: %s", pdf_file)
             else:
-                logger.warning(f"LaTeX compilation completed but PDF file not found: {pdf_file}")
+                logger.warning("LaTeX compilation completed but PDF file not found: %s", pdf_file)
         except subprocess.CalledProcessError:
             logger.warning("Failed to compile LaTeX document. Is pdflatex installed?")
         except FileNotFoundError:
@@ -85,7 +85,7 @@ def main():
         logger.info("End-to-end test completed successfully")
         return 0
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
 
 if __name__ == "__main__":
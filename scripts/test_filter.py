@@ -27,12 +27,12 @@ def main():
         # Fetch some puzzles
         mate_in = 2
         count = 10
-        logger.info(f"Fetching {count} puzzles...")
+        logger.info("Fetching %s puzzles...", count)
         
         raw_puzzles = api.fetch_puzzles(mate_in=mate_in, count=count)
         
         # Filter the puzzles
-        logger.info(f"Filtering {len(raw_puzzles)} puzzles for mate-in-{mate_in}...")
+        logger.info("Filtering %s puzzles for mate-in-%s...", len(raw_puzzles), mate_in)
         
         filtered_puzzles = puzzle_filter.filter_mate_puzzles(
             puzzles=raw_puzzles,
@@ -41,17 +41,14 @@ def main():
         )
         
         # Print the filtered puzzles
-        logger.info(f"Successfully filtered {len(filtered_puzzles)} puzzles")
+        logger.info("Successfully filtered %s puzzles", len(filtered_puzzles))
         for i, puzzle in enumerate(filtered_puzzles, 1):
-            logger.info(f"Filtered Puzzle {i}:")
-            logger.info(f"  ID: {puzzle['id']}")
-            logger.info(f"  Rating: {puzzle['rating']}")
-            logger.info(f"  Moves: {puzzle['moves']}")
-            logger.info(f"  Solution: {puzzle['solution']}")
+            logger.info("Filtered Puzzle %s:\n  ID: %s\n  Rating: %s\n  Moves: %s\n  Solution: %s",
+                        i, puzzle['id'], puzzle['rating'], puzzle['moves'], puzzle['solution'])
         
         return 0
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
 
 if __name__ == "__main__":
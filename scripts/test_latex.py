@@ -30,7 +30,7 @@ def main():
         # Fetch and filter puzzles
         mate_in = 2
         count = 3
-        logger.info(f"Fetching and filtering {count} mate-in-{mate_in} puzzles...")
+        logger.info("Fetching and filtering %s mate-in-%s puzzles...", count, mate_in)
         
         raw_puzzles = api.fetch_puzzles(mate_in=mate_in, count=count)
         filtered_puzzles = puzzle_filter.filter_mate_puzzles(
@@ -42,7 +42,7 @@ def main():
         # Generate LaTeX document
         output_file = "test_latex.tex"
         title = "Test LaTeX Generation"
-        logger.info(f"Generating LaTeX document with {len(filtered_puzzles)} puzzles...")
+        logger.info("Generating LaTeX document with %s puzzles...", len(filtered_puzzles))
         
         latex_generator.generate_document(
             puzzles=filtered_puzzles,
@@ -54,14 +54,14 @@ def main():
         # Check if the file was created
         if os.path.exists(output_file):
             file_size = os.path.getsize(output_file)
-            logger.info(f"Successfully generated LaTeX document: {output_file} ({file_size} bytes)")
+            logger.info("Successfully generated LaTeX document: %s (%s bytes)", output_file, file_size)
         else:
-            logger.error(f"Failed to generate LaTeX document: {output_file}")
+            logger.error("Failed to generate LaTeX document: %s", output_file)
             return 1
         
         return 0
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
+        logger.error("Error: %s", e)
         return 1
 
 if __name__ == "__main__":
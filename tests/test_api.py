@@ -92,6 +92,18 @@ def test_is_mate_in_m():
     }
     assert not api._is_mate_in_m(puzzle4, 2)
 
+def test_is_mate_in_m_specific_tag():
+    """Test that a specific mate-in tag must match the requested value."""
+    api = LichessAPI()
+    
+    puzzle = {
+        "id": "puzzle5",
+        "moves": ["d1h5", "g8f6", "h5f7"],
+        "themes": ["mate", "mateIn2", "middlegame"]
+    }
+    assert api._is_mate_in_m(puzzle, 2)
+    assert not api._is_mate_in_m(puzzle, 3)
+
 def test_flip_fen_turn():
     """Test flipping the turn in a FEN string."""
     api = LichessAPI()
@@ -0,0 +1,33 @@
+"""
+Tests for the command-line entry point.
+"""
+
+import sys
+
+import lichess_puzzle_extractor
+
+CSV_HEADER = "PuzzleId,FEN,Moves,Rating,RatingDeviation,Popularity,NbPlays,Themes,GameUrl,OpeningTags"
+
+FEN = "q3k1nr/1pp1nQpp/3p4/1P2p3/4P3/B1PP1b2/B5PP/5K2 b k - 0 17"
+
+def _row(puzzle_id, themes):
+    """Build a CSV row with the given ID and themes."""
+    return f"{puzzle_id},{FEN},e8d7 a2e6 d7d8 f7f8,1500,80,90,100,{themes},https://lichess.org/x#1,"
+
+def test_mix_ratio_returns_full_count(tmp_path, monkeypatch):
+    """Test that a mixed set keeps its tactical puzzles as well as its mate puzzles."""
+    rows = [_row(f"tac{i}", "fork middlegame") for i in range(6)]
+    rows += [_row(f"mate{i}", "mate mateIn2 short") for i in range(6)]
+    csv_path = tmp_path / "lichess_db_puzzle.csv"
+    csv_path.write_text("\n".join([CSV_HEADER] + rows) + "\n")
+    output = tmp_path / "out.tex"
+
+    monkeypatch.setattr(sys, "argv", [
+        "lichess_puzzle_extractor.py", "-f", str(csv_path), "-o", str(output),
+        "-mx", "1,2", "--mix-ratio", "50:50", "-n", "10",
+    ])
+
+    assert lichess_puzzle_extractor.main() == 0
+    content = output.read_text()
+    assert content.count(r"\subsection*{Puzzle") == 10
+    assert content.count(r"\textbf{Puzzle") == 10
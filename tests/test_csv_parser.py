@@ -0,0 +1,147 @@
+"""
+Tests for the CSV parser module.
+"""
+
+import sqlite3
+from contextlib import closing
+
+import pytest
+from puzzle_extractor import csv_parser
+from puzzle_extractor.csv_parser import PuzzleCSVParser
+from puzzle_extractor.csv_rows import split_row
+from puzzle_extractor.puzzle_index import PuzzleIndex
+
+CSV_HEADER = "PuzzleId,FEN,Moves,Rating,RatingDeviation,Popularity,NbPlays,Themes,GameUrl,OpeningTags"
+
+CSV_ROWS = [
+    "00sHx,q3k1nr/1pp1nQpp/3p4/1P2p3/4P3/B1PP1b2/B5PP/5K2 b k - 0 17,e8d7 a2e6 d7d8 f7f8,1760,80,83,72,mate mateIn2 middlegame short,https://lichess.org/yyznGmXs/black#34,Italian_Game",
+    "00sJ9,r3r1k1/p4ppp/2p2n2/1p6/3P1qb1/2NQR3/PPB2PP1/R1B3K1 w - - 5 18,e3g3 e8e1 g1h2 e1c1 a1c1 f4h6 h2g1 h6c1,2671,105,87,325,advantage attraction fork middlegame sacrifice veryLong,https://lichess.org/gyFeQsOE#35,French_Defense",
+    "00sJb,Q1b2r1k/p2np2p/5bp1/q7/5P2/4B3/PPP3PP/2KR1B1R w - - 1 17,d1d7 a5e1 d7d1 e1e3 c1b1 e3b6,2235,76,97,64,advantage fork long,https://lichess.org/kiuvTFoE#33,Sicilian_Defense",
+    "00sO1,1k1r4/pp3pp1/2p1p3/4b3/P3n1P1/8/KPP2PN1/3rBR1R b - - 2 31,b8c7 e1a5 b7b6 f1d1,998,85,94,293,advantage discoveredAttack master middlegame short,https://lichess.org/vsfFkG0s/black#62,",
+    "01Abc,6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1,g1f1 d1d8,1200,80,90,100,endgame mate mateIn1 oneMove,https://lichess.org/abcdefgh#50,",
+]
+
+@pytest.fixture
+def csv_file(tmp_path):
+    """Create a small puzzle database in the Lichess CSV format."""
+    path = tmp_path / "lichess_db_puzzle.csv"
+    path.write_text("\n".join([CSV_HEADER] + CSV_ROWS) + "\n")
+    return str(path)
+
+def test_fetch_mate_puzzles(csv_file):
+    """Test fetching puzzles for a single mate-in value."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    puzzles = parser.fetch_puzzles(mate_in=2, count=10)
+
+    assert [p["id"] for p in puzzles] == ["00sHx"]
+    assert puzzles[0]["moves"] == ["e8d7", "a2e6", "d7d8", "f7f8"]
+    assert puzzles[0]["rating"] == 1760
+    assert "mateIn2" in puzzles[0]["themes"]
+
+def test_fetch_puzzles_by_theme_and_rating(csv_file):
+    """Test fetching themed puzzles within a rating range."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    puzzles = parser.fetch_puzzles(count=10, themes=["fork"], max_rating=2500)
+
+    assert [p["id"] for p in puzzles] == ["00sJb"]
+
+def test_fetch_puzzles_by_ply(csv_file):
+    """Test fetching puzzles by solution ply count."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    puzzles = parser.fetch_puzzles(count=10, ply_values=[3])
+
+    assert sorted(p["id"] for p in puzzles) == ["00sHx", "00sO1"]
+
+def test_fetch_puzzles_missing_file(tmp_path):
+    """Test that a missing database yields no puzzles."""
+    parser = PuzzleCSVParser(csv_path=str(tmp_path / "missing.csv"))
+
+    assert parser.fetch_puzzles(mate_in=2) == []
+
+def test_fetch_mixed_mate_puzzles(csv_file):
+    """Test that mate values restrict the scan to matching mate puzzles."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    puzzles = parser.fetch_puzzles(count=10, mate_values=[1, 2])
+
+    assert sorted(p["id"] for p in puzzles) == ["00sHx", "01Abc"]
+
+def test_fetch_mate_puzzles_builds_index(csv_file):
+    """Test that filtered lookups build and reuse the sidecar index."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    parser.fetch_puzzles(mate_in=2, count=10)
+
+    index = PuzzleIndex(csv_file)
+    assert index.is_current()
+    assert len(index.offsets(["mateIn1", "mateIn2"])) == 2
+    assert index.offsets(["mateIn2"], min_rating=1800) == ()
+    assert len(index.offsets(["fork"], ply_values=[5, 7])) == 2
+    assert len(index.offsets(max_rating=2500)) == 4
+
+    puzzles = parser.fetch_puzzles(count=10, mate_values=[1], max_rating=1500)
+    assert [p["id"] for p in puzzles] == ["01Abc"]
+
+def test_index_rebuilt_when_csv_changes(csv_file):
+    """Test that a stale index is rebuilt after the CSV file changes."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    parser.fetch_puzzles(mate_in=1, count=10)
+
+    with open(csv_file, "a") as f:
+        f.write("02Xyz,6k1/5ppp/8/8/8/8/5PPP/3R2K1 w - - 0 1,g1f1 d1d8,1300,80,90,100,mate mateIn1,https://lichess.org/xyz#1,\n")
+
+    puzzles = parser.fetch_puzzles(mate_in=1, count=10)
+    assert sorted(p["id"] for p in puzzles) == ["01Abc", "02Xyz"]
+
+def test_index_rebuilt_for_old_version(csv_file):
+    """Test that an index with an outdated layout is not used."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    parser.fetch_puzzles(themes=["fork"], count=10)
+
+    index = PuzzleIndex(csv_file)
+    with closing(sqlite3.connect(index.index_path)) as conn:
+        conn.execute("PRAGMA user_version = 1")
+    assert not index.is_current()
+
+    puzzles = parser.fetch_puzzles(themes=["fork"], count=10)
+    assert sorted(p["id"] for p in puzzles) == ["00sJ9", "00sJb"]
+    assert index.is_current()
+
+def test_fetch_puzzles_samples_count(csv_file):
+    """Test that only the requested number of matches is sampled."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    puzzles = parser.fetch_puzzles(count=2, themes=["middlegame", "endgame"])
+
+    assert len(puzzles) == 2
+    assert len({p["id"] for p in puzzles}) == 2
+
+def test_fetch_puzzles_with_mix_ratio(csv_file):
+    """Test sampling tactical and mate puzzles by ratio."""
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    puzzles = parser.fetch_puzzles(count=2, mate_values=[2], tactical_ratio=50)
+
+    assert len(puzzles) == 2
+    assert "mateIn2" not in puzzles[0]["themes"]
+    assert "mateIn2" in puzzles[1]["themes"]
+
+def test_fetch_puzzles_parallel_scan(csv_file, monkeypatch):
+    """Test that a chunked scan in worker processes finds every match."""
+    monkeypatch.setattr(csv_parser, "PARALLEL_SCAN_MIN_BYTES", 0)
+    monkeypatch.setattr(csv_parser, "_worker_count", lambda: 3)
+    parser = PuzzleCSVParser(csv_path=csv_file)
+    puzzles = parser.fetch_puzzles(count=10, max_rating=2500)
+
+    assert sorted(p["id"] for p in puzzles) == ["00sHx", "00sJb", "00sO1", "01Abc"]
+
+def test_split_row_handles_quoted_fields():
+    """Test that quoted fields still split like the csv module."""
+    assert split_row(b"a,b c,1\r\n") == ["a", "b c", "1"]
+    assert split_row(b'a,"b, c",1') == ["a", "b, c", "1"]
+
+def test_index_parses_ratings_like_the_scan(tmp_path):
+    """Test that indexed lookups keep rows whose rating int() accepts."""
+    path = tmp_path / "lichess_db_puzzle.csv"
+    row = CSV_ROWS[0].replace(",1760,", ", 1760,")
+    path.write_text("\n".join([CSV_HEADER, row]) + "\n")
+    parser = PuzzleCSVParser(csv_path=str(path))
+
+    puzzles = parser.fetch_puzzles(mate_in=2, count=10, min_rating=1700)
+    assert [p["id"] for p in puzzles] == ["00sHx"]
@@ -75,4 +75,22 @@ def test_convert_to_algebraic():
     moves = ["e2e4", "e7e5", "d1h5"]
     algebraic = puzzle_filter._convert_to_algebraic(moves)
     
-    assert algebraic == moves 
\ No newline at end of file
+    assert algebraic == moves 
+
+def test_filter_puzzles_skips_duplicate_ids(sample_puzzles, monkeypatch):
+    """Test that duplicates are dropped and only selected puzzles are processed."""
+    puzzle_filter = PuzzleFilter()
+    
+    processed = []
+    process_puzzle = puzzle_filter._process_puzzle
+    def counting_process_puzzle(puzzle):
+        processed.append(puzzle["id"])
+        return process_puzzle(puzzle)
+    monkeypatch.setattr(puzzle_filter, "_process_puzzle", counting_process_puzzle)
+    
+    duplicates = [dict(puzzle) for puzzle in sample_puzzles]
+    filtered = puzzle_filter.filter_puzzles(sample_puzzles + duplicates, count=2)
+    
+    assert len(filtered) == 2
+    assert len({p["id"] for p in filtered}) == 2
+    assert sorted(processed) == sorted(p["id"] for p in filtered)
@@ -4,6 +4,7 @@ Tests for the LaTeX generator module.
 
 import pytest
 import os
+import re
 from puzzle_extractor.latex_generator import LaTeXGenerator
 
 @pytest.fixture
@@ -81,4 +82,13 @@ def test_generate_document(sample_puzzles, tmp_path):
         assert r"\documentclass" in content
         assert r"\title{Test Puzzles}" in content
         assert r"Puzzle 1" in content
-        assert r"Puzzle 2" in content 
\ No newline at end of file
+        assert r"Puzzle 2" in content 
+
+def test_escape_chess_notation_matches_regex():
+    """Test that escaping gives the same output as the original regex."""
+    generator = LaTeXGenerator()
+    moves = ["Qxf7#", "e8=Q+", "O-O-O", "a_b", "{Nf3}", "$5 & 10%", ""]
+    
+    for move in moves:
+        expected = re.sub(r"([#\$%&_\{\}])", r"\\\1", move)
+        assert generator._escape_chess_notation(move) == expected